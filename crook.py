@@ -1,34 +1,45 @@
 import os
-
-import regex as re
+import threading
+import time
 
 from collections import Counter
 from datetime import datetime
 from dotenv import load_dotenv
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Tuple
 from zoneinfo import ZoneInfo
 
-from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-from src.schemas import CaseSearchConfig, CourtCase
+from src.browser_pool import block_page_assets, clone_session, map_on_idle_drivers, quit_driver, start_driver
+from src.extract import get_case_details, get_result_rows
+from src.schemas import CaseSearchConfig, CourtCase, DateCoverage
 from src.search import get_search_coverage, search_for_cases
 from src.utils import (
     prompt_for_date_range,
     parse_init_action,
-    extract_span_texts,
+    append_record,
+    compact_records_log,
     load_records,
-    lookup_court_case,
+    load_records_log,
+    open_append_log,
     sleepy_click,
     write_json_atomic,
+    count_date_range,
     expand_date_range
 )
 
 
+# page locators
+_RESULTS_GRID = (By.ID, "grid")
+_NEXT_PAGE_LINK = (By.XPATH, "//a[@title='Go to next page']")
+_HOME_LINK = (By.LINK_TEXT, "Home")
+_SEARCH_BUTTON = (By.CSS_SELECTOR, "a.anchorButton.welcome-section")
+
 # environment variables
 load_dotenv()
 
@@ -42,6 +53,12 @@ results_per_page = os.getenv("RESULTS_PER_PAGE")
 # allow for update_seen to be unset
 update_seen = os.getenv("UPDATE_SEEN", "")
 
+# allow for refresh_seen_fields to be unset
+refresh_seen_fields = os.getenv("REFRESH_SEEN_FIELDS", "")
+
+# number of browsers scraping dates at the same time
+max_concurrency = os.getenv("MAX_CONCURRENCY")
+
 try:
     # format the jitter factor
     jitter_factor = float(jitter_factor)
@@ -54,6 +71,13 @@ if jitter_factor < 0:
     print(f"Negatives are not allowed, assuming a jitter factor of {abs(jitter_factor)}")
     jitter_factor = abs(jitter_factor)
 
+try:
+    # format the concurrency
+    max_concurrency = max(1, int(max_concurrency))
+except (TypeError, ValueError):
+    # defaults to a single browser
+    max_concurrency = 1
+
 # config
 timeout = 5  # seconds
 fast_timeout = 3  # seconds
@@ -68,11 +92,17 @@ try:
 except Exception:
     update_seen = False
 
+try:
+    refresh_seen_fields = refresh_seen_fields.strip().lower() in {"true", "yes", "y"}
+except Exception:
+    refresh_seen_fields = False
+
 # load records
 data_dir = Path(data_dir_path or "data/crook")
 data_dir.mkdir(parents=True, exist_ok=True)
 
 records_path = data_dir / "records.json"
+records_log_path = data_dir / "records.jsonl"
 
 runs_dir = data_dir / "runs"
 runs_dir.mkdir(parents=True, exist_ok=True)
@@ -99,9 +129,13 @@ output_path = outputs_dir / f"{run_name}.xlsx"
 
 # load existing records
 case_records = load_records(records_path)
-print(f"Loaded {len(list(case_records.keys()))} existing case records")
-if update_seen:
+case_records.update(load_records_log(records_log_path))
+seen_case_numbers = set(case_records)
+print(f"Loaded {len(case_records)} existing case records")
+if update_seen and refresh_seen_fields:
     print("Previously seen cases will be update (if possible)")
+elif update_seen:
+    print("Previously seen cases will be marked as updated without revisiting their details")
 else:
     print("Previously seen cases will not be updated")
 
@@ -119,343 +153,246 @@ run_data = {
     "results": {},  # mapping: case_number (str) -> result fields for this run
 }
 
-try:
-    # access the website
-    options = webdriver.ChromeOptions()
-    options.add_argument("--incognito")
-    driver = webdriver.Chrome(options=options)
-    driver.get(website_url)
+# per-date coverage, folded into run_data["coverage"] when the run is saved
+date_coverage: Dict[str, DateCoverage] = {}
 
-    # rely on user to complete recaptcha
-    print("Please prove that you're not a robot")
-    try:
-        WebDriverWait(driver, 180).until(
-            EC.url_contains("search.page")
-        )
-        print("Human verification completed successfully")
-    except TimeoutException:
-        print("Human verification was not completed within the tme limit")
-        driver.close()
+# shared between the per-date workers
+records_lock = threading.Lock()
 
-    # primary search configuration
-    main_search_config = CaseSearchConfig(
-        court_departments = ["Housing Court"],
-        court_divisions=["Northeast Housing Court"],
-        court_locations=["Northeast Housing Court"],
-        results_per_page=results_per_page,
-        start_date=start_date,
-        end_date=end_date,
-        case_types=["Housing Court Summary Process"],
-        cities=["All Cities"],
-        statuses=["Active", "Closed"],
-        party_types=["Defendant"],
-        min_sleep=min_sleep,
-        max_sleep=max_sleep,
+
+# formatted timestamp, refreshed at most once per second
+_now_cache = {"second": -1, "formatted": ""}
+
+
+def _cached_now() -> str:
+    """Return the current time formatted with `run_time_format` (second resolution)."""
+    now = time.time()
+    second = int(now)
+    if second != _now_cache["second"]:
+        _now_cache["formatted"] = datetime.fromtimestamp(now, tz_info).strftime(run_time_format)
+        _now_cache["second"] = second
+    return _now_cache["formatted"]
+
+
+def scrape_date(driver: WebDriver, search_date: str) -> None:
+    """Search a single day and record every case found.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Selenium webdriver with a verified session, on the search page.
+
+    search_date : str
+        Day to search (mm/dd/yyyy).
+
+    """
+    # create a new search config that spans only a single day
+    temp_search_config = main_search_config.copy(
+        start_date=search_date,
+        end_date=search_date,
     )
-    search_config_dict = main_search_config.to_dict()
 
-    dates_to_search = expand_date_range(main_search_config.start_date, main_search_config.end_date)
+    # search for the cases
+    search_for_cases(driver, temp_search_config, timeout)
 
-    for search_date in dates_to_search:
-        # create a new search config that spans only a single day
-        temp_search_config = main_search_config.copy(
-            start_date=search_date,
-            end_date=search_date,
-        )
+    # find the coverage from this query
+    search_coverage = get_search_coverage(driver, timeout)
+    cov = date_coverage[search_date] = DateCoverage(accessible=search_coverage)
 
-        # search for the cases
-        search_for_cases(driver, temp_search_config, timeout)
-
-        # find the coverage from this query
-        search_coverage = get_search_coverage(driver, timeout)
-        run_data["coverage"][search_date] = {"found": 0, "duplicates": 0, "recorded": 0, "accessible": search_coverage}
-
-        keep_alive = True
-        while keep_alive:
-            try:
-                # parse search results
-                results_table = WebDriverWait(driver, fast_timeout).until(
-                    EC.presence_of_element_located((By.ID, "grid"))
-                )
-                table_body = results_table.find_element(By.TAG_NAME, "tbody")
-                cards = table_body.find_elements(By.TAG_NAME, "tr")
-            except (TimeoutException, NoSuchElementException):
-                keep_alive = False
-                print(f"No results found for date {search_date}")
-                break  # leave loop, no results found
-
-            case_list: List[Tuple[CourtCase, str]] = []
-            for card in cards:
-                card_components = card.find_elements(By.TAG_NAME, "td")
-                try:
-                    # case links are stored in 3rd column, listed as "Case Number"
-                    case_link = card_components[3]
-                    case_url = case_link.find_element(By.TAG_NAME, "a").get_attribute("href")
-                    case_number = case_link.text.strip()
-
-                    # creation time
-                    time_now = datetime.now(tz_info).strftime(run_time_format)
-
-                    # check if we've seen this case before
-                    if lookup_court_case(case_records, case_number):
-                        # create an instance of the case
-                        seen_case = CourtCase(**case_records[case_number])
-                        # update parameters
-                        seen_case.status = "seen"
-                        seen_case.updated_at = time_now
-                        # add to case_list if we want to update
-                        if update_seen:
-                            case_list.append((seen_case, case_url))
-                        # skip to next card
-                        continue
-
-                    # create a CourtCase instance and add it to the list
-                    case_obj = CourtCase(
-                        case_number = case_link.text.strip(),
-                        status = "new",
-                        file_date = card_components[5].text.strip(),
-                        primary_party = card_components[2].text.strip(),
-                        defendant = "",
-                        plaintiff = "",
-                        init_action = parse_init_action(card_components[6].text.strip()),
-                        address= None,
-                        zipcode=None,
-                        created_at=time_now,
-                        updated_at=time_now,
-                    )
-                    case_list.append((case_obj, case_url))
-                except (IndexError, TimeoutException):
-                    # result does not match format, skip
-                    continue
+    # local handles for the shared run maps
+    results_map = run_data["results"]
+    counts_map = run_data["counts"]
 
-            # pull out the CourtCase objects, then count duplicate case_numbers
-            duplicate_case_count = len([
-                n for n, cnt in Counter([c.case_number for c, _ in case_list]).items()
-                if cnt > 1
-            ])
-            run_data["counts"]["skipped"] += duplicate_case_count
-
-            # date-specific metrics
-            run_data["coverage"][search_date]["found"] = len(case_list)
-            run_data["coverage"][search_date]["duplicates"] = duplicate_case_count
-
-            # to avoid stale links, we grab all the data from the page then cycle over the links
-            for court_case, fresh_url in case_list:
-                # skip if we've already recorded this case_number in this run
-                if court_case.case_number in run_data["results"]:
+    keep_alive = True
+    while keep_alive:
+        try:
+            # wait for the search results
+            WebDriverWait(driver, fast_timeout).until(
+                EC.presence_of_element_located(_RESULTS_GRID)
+            )
+        except TimeoutException:
+            keep_alive = False
+            print(f"No results found for date {search_date}")
+            break  # leave loop, no results found
+
+        # read every result row in a single round-trip
+        result_rows = get_result_rows(driver)
+
+        case_list: List[Tuple[CourtCase, str]] = []
+        for row in result_rows:
+            # link and number both come from the "Case Number" column
+            case_url = row["href"]
+            case_number = row["case_number"]
+
+            # creation time
+            time_now = _cached_now()
+
+            # check if we've seen this case before
+            if case_number in seen_case_numbers:
+                # create an instance of the case
+                seen_case = CourtCase(**case_records[case_number])
+                # update parameters
+                seen_case.status = "seen"
+                seen_case.updated_at = time_now
+                # add to case_list if we want to update
+                if update_seen:
+                    case_list.append((seen_case, case_url))
+                # skip to next card
+                continue
+
+            # create a CourtCase instance and add it to the list
+            case_obj = CourtCase(
+                case_number = case_number,
+                status = "new",
+                file_date = row["file_date"],
+                primary_party = row["primary_party"],
+                defendant = "",
+                plaintiff = "",
+                init_action = parse_init_action(row["init_action"]),
+                address= None,
+                zipcode=None,
+                created_at=time_now,
+                updated_at=time_now,
+            )
+            case_list.append((case_obj, case_url))
+
+        # count repeated case_numbers in a single pass
+        listed_case_numbers = set()
+        duplicate_case_count = 0
+        for c, _ in case_list:
+            if c.case_number in listed_case_numbers:
+                duplicate_case_count += 1
+            else:
+                listed_case_numbers.add(c.case_number)
+        with records_lock:
+            counts_map["skipped"] += duplicate_case_count
+
+        # date-specific metrics
+        cov.found = len(case_list)
+        cov.duplicates = duplicate_case_count
+
+        # to avoid stale links, we grab all the data from the page then cycle over the links
+        for court_case, fresh_url in case_list:
+            # skip if we've already recorded this case_number in this run
+            with records_lock:
+                if court_case.case_number in results_map:
                     continue
 
+            # seen cases only need their details again when asked to refresh them
+            if refresh_seen_fields or court_case.status != "seen":
                 # visit each "Case Detail" page
                 driver.get(fresh_url)  # this should always be fresh, not stored
 
                 try:
-                    # parse out the property address
-                    address_container = WebDriverWait(driver, fast_timeout).until(
-                        EC.presence_of_element_located((By.ID, "addressInfo"))
-                    )
-                    address_rows = address_container.find_elements(By.TAG_NAME, "div")
-
-                    # need at least two rows to hold street, city, state, and zipcode
-                    street_parts = extract_span_texts(address_rows[0])  # i.e. ["23", "Prince", "Street", "9"]
-                    place_parts = extract_span_texts(address_rows[1])  # i.e. ["Danvers", "MA", "01923"]
-
-                    # city, state zIP — tolerate missing pieces and stray spacing
-                    city = place_parts[0] if len(place_parts) >= 1 else ""
-                    state = place_parts[1] if len(place_parts) >= 2 else ""
-                    zipc = place_parts[2] if len(place_parts) >= 3 else ""
-                
-                    # combined strings
-                    line1 = " ".join(street_parts)
-                    line2 = ", ".join(filter(None, [city, state])) + (f" {zipc}" if zipc else "")
-                    full_address = f"{line1}, {line2}" if line2 else line1
-
-                    # update address
-                    court_case.address = full_address
-                    court_case.zipcode = zipc
-
-                except (KeyError, IndexError, TimeoutException, NoSuchElementException):
-                    # don't update address
-                    pass
-
-                try:
-                    # parse out plaintiff and defendant
-                    party_info_container = WebDriverWait(driver, timeout).until(
-                        EC.presence_of_element_located((By.ID, "ptyContainer"))
-                    )
-
-                    # Only consider DIRECT child rows of #ptyContainer (rowodd/roweven)
-                    party_blocks = party_info_container.find_elements(
-                        By.XPATH, "./div[starts-with(@class,'row')]"
-                    )
-
-                    first_plaintiff: Optional[str] = None
-                    first_defendant: Optional[str] = None
-
-                    for block in party_blocks:
-                        try:
-                            # name/role live inside the subSectionHeader2 header
-                            header = block.find_element(By.CLASS_NAME, "subSectionHeader2")
-                            name = header.find_element(By.CLASS_NAME, "ptyInfoLabel").text.strip()
-                            role_raw = header.find_element(By.CLASS_NAME, "ptyType").text
-                        except NoSuchElementException:
-                            continue
+                    # address, parties, docket, dispositions and judgments in one read
+                    case_details = get_case_details(driver, fast_timeout)
+                except WebDriverException as e:
+                    print(f"[!] Case detail extraction failed: {e}")
+                    case_details = {}
+
+                for field_name, value in case_details.items():
+                    setattr(court_case, field_name, value)
+
+            if update_seen and (court_case.status == "seen"):
+                # update metadata for previously seen cases
+                court_case.status = "updated"
+                court_case.updated_at = _cached_now()
+
+            # record the court case
+            case_dict = court_case.to_dict()
+            with records_lock:
+                results_map[court_case.case_number] = case_dict
+                case_records[court_case.case_number] = case_dict
+                seen_case_numbers.add(court_case.case_number)
+                append_record(records_log, case_dict)
 
-                        # normalize role text like " - Plaintiff"
-                        role = re.sub(r"\s|-", " ", role_raw).strip().lower()
+            cov.recorded += 1
 
-                        if ("plaintiff" in role) and (first_plaintiff is None):
-                            first_plaintiff = name
-                        if ("defendant" in role) and (first_defendant is None):
-                            first_defendant = name
+        # attempt to access more results
+        try:
+            # wait until the "next page" button is clickable
+            next_page_btn = WebDriverWait(driver, timeout).until(
+                EC.element_to_be_clickable(_NEXT_PAGE_LINK)
+            )
+            sleepy_click(next_page_btn, min_sleep, max_sleep)
+        except TimeoutException:
+            print(f"Exhausted results for {search_date} (Coverage: {round(search_coverage, 3)*100}%).")
+            keep_alive = False
+            break
+
+    # go back home to start the next search
+    home_link = WebDriverWait(driver, timeout).until(
+        EC.element_to_be_clickable(_HOME_LINK)
+    )
+    sleepy_click(home_link, min_sleep, max_sleep)
 
-                        if first_plaintiff and first_defendant:
-                            break
+    # click the search button to begin a fresh search
+    search_button = WebDriverWait(driver, timeout).until(
+        EC.element_to_be_clickable(_SEARCH_BUTTON)
+    )
+    sleepy_click(search_button, min_sleep, max_sleep)
 
-                    # update the case
-                    court_case.plaintiff = first_plaintiff
-                    court_case.defendant = first_defendant
 
-                except (TimeoutException, NoSuchElementException):
-                    # don't update
-                    pass
+drivers: List[WebDriver] = []
 
+# new and updated records are appended as they are scraped
+records_log = open_append_log(records_log_path)
 
-                try:
-                    docket_table = WebDriverWait(driver, timeout).until(
-                        EC.presence_of_element_located((By.ID, "docketInfo"))
-                    )
-
-                    rows = docket_table.find_elements(By.XPATH, ".//tbody/tr")
-                    docket_entries = []
-
-                    for row in rows:
-                        try:
-                            cells = row.find_elements(By.TAG_NAME, "td")
-                            if len(cells) >= 2:
-                                docket_date = cells[0].text.strip()
-                                docket_text = cells[1].text.strip()
-                                docket_entries.append({"date": docket_date, "text": docket_text})
-                        except NoSuchElementException:
-                            continue
-
-                    court_case.docket_entries = docket_entries
-
-                except TimeoutException:
-                    court_case.docket_entries = []
-                except Exception as e:
-                    print(f"[!] Docket extraction failed: {e}")
-                    court_case.docket_entries = []
+try:
+    # access the website (reuses the persisted browser profile)
+    driver = start_driver(data_dir / "chrome-profile", pinned_url=website_url)
+    drivers.append(driver)
+    driver.get(website_url)
 
-                try:
-                    disposition_table = WebDriverWait(driver, timeout).until(
-                        EC.presence_of_element_located((By.ID, "dispositionInfo"))
-                    )
-
-                    rows = disposition_table.find_elements(By.XPATH, ".//tbody/tr")
-                    disposition_entries = []
-
-                    for row in rows:
-                        try:
-                            cells = row.find_elements(By.TAG_NAME, "td")
-                            if len(cells) >= 2:
-                                disposition = cells[0].text.strip()
-                                date = cells[1].text.strip()
-                                disposition_entries.append({"disposition": disposition, "date": date})
-                        except NoSuchElementException:
-                            continue
-
-                    court_case.dispositions = disposition_entries
-
-                except TimeoutException:
-                    court_case.dispositions = []
-                except Exception as e:
-                    print(f"[!] Disposition extraction failed: {e}")
-                    court_case.dispositions = []
+    if "search.page" in driver.current_url:
+        print("Existing session is still verified")
+    else:
+        # rely on user to complete recaptcha
+        print("Please prove that you're not a robot")
+        try:
+            WebDriverWait(driver, 180).until(
+                EC.url_contains("search.page")
+            )
+            print("Human verification completed successfully")
+        except TimeoutException:
+            print("Human verification was not completed within the tme limit")
+            quit_driver(driver)
 
-                try:
-                    judgment_table = WebDriverWait(driver, timeout).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, ".judgementsInfo table"))
-                    )
-
-                    rows = judgment_table.find_elements(By.XPATH, ".//tbody/tr")
-                    judgments = []
-
-                    for row in rows:
-                        try:
-                            cells = row.find_elements(By.TAG_NAME, "td")
-                            if len(cells) >= 5:
-                                judgment_date = cells[0].text.strip()
-                                judgment_type = cells[1].text.strip()
-                                method = cells[2].text.strip()
-                                for_party = cells[3].text.strip()
-                                against_party = cells[4].text.strip()
-                                judgments.append({
-                                    "date": judgment_date,
-                                    "type": judgment_type,
-                                    "method": method,
-                                    "for": for_party,
-                                    "against": against_party,
-                                })
-                        except NoSuchElementException:
-                            continue
-
-                    court_case.judgments = judgments
-
-                except TimeoutException:
-                    court_case.judgments = []
-                except Exception as e:
-                    print(f"[!] Judgment extraction failed: {e}")
-                    court_case.judgments = []
-
-
-                if update_seen and (court_case.status == "seen"):
-                    # update metadata for previously seen cases
-                    court_case.status = "updated"
-                    court_case.updated_at = datetime.now(tz_info).strftime(run_time_format)
-
-                # record the court case
-                case_dict = court_case.to_dict()
-                run_data["results"][court_case.case_number] = case_dict
-                case_records[court_case.case_number] = case_dict
+    # primary search configuration
+    main_search_config = CaseSearchConfig(
+        court_departments = ["Housing Court"],
+        court_divisions=["Northeast Housing Court"],
+        court_locations=["Northeast Housing Court"],
+        results_per_page=results_per_page,
+        start_date=start_date,
+        end_date=end_date,
+        case_types=["Housing Court Summary Process"],
+        cities=["All Cities"],
+        statuses=["Active", "Closed"],
+        party_types=["Defendant"],
+        min_sleep=min_sleep,
+        max_sleep=max_sleep,
+    )
+    search_config_dict = main_search_config.to_dict()
 
-                run_data["coverage"][search_date]["recorded"] += 1
-
-            # attempt to access more results
-            try:
-                # wait until the "next page" button is clickable
-                next_page_btn = WebDriverWait(driver, timeout).until(
-                    EC.element_to_be_clickable((By.XPATH, "//a[@title='Go to next page']"))
-                )
-                sleepy_click(next_page_btn, min_sleep, max_sleep)
-            except TimeoutException:
-                print(f"Exhausted results for {search_date} (Coverage: {round(search_coverage, 3)*100}%).")
-                keep_alive = False
-                break
-        
-        # go back home to start the next search
-        home_link = WebDriverWait(driver, timeout).until(
-            # using link text
-            EC.element_to_be_clickable((By.LINK_TEXT, "Home"))
-        )
-        sleepy_click(home_link, min_sleep, max_sleep)
+    dates_to_search = expand_date_range(main_search_config.start_date, main_search_config.end_date)
 
-        # click the search button to begin a fresh search
-        search_button = WebDriverWait(driver, timeout).until(
-            # using link text
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "a.anchorButton.welcome-section"))
-        )
-        sleepy_click(search_button, min_sleep, max_sleep)
+    # spread the dates over the driver pool, one date per driver at a time (never more drivers than dates)
+    days_to_search = count_date_range(main_search_config.start_date, main_search_config.end_date)
+    drivers += [clone_session(driver, driver.current_url) for _ in range(min(max_concurrency, days_to_search) - 1)]
+    for d in drivers:
+        # case pages only need their HTML, skip the heavy subresources
+        block_page_assets(d)
 
+    map_on_idle_drivers(drivers, scrape_date, dates_to_search)
 
 except Exception as e:
     print(f"Encountered a fatal exception: {e}")
 finally:
     try:
-        try:
-            # shutdown the driver (if it exists)
-            driver.close()
-        except Exception:
-            pass
+        # shutdown the drivers (if they exist)
+        for d in drivers:
+            quit_driver(d)
 
         # save the run
         run_end_time = datetime.now(tz_info)
@@ -466,6 +403,7 @@ finally:
 
         run_data["ended_at"] = run_end_time.strftime(run_time_format)
         run_data["time_elapsed"] = elapsed_time_rounded
+        run_data["coverage"] = {d: cov.to_dict() for d, cov in date_coverage.items()}
 
         # count statuses
         status_counts = Counter(
@@ -486,9 +424,12 @@ finally:
         write_json_atomic(run_path, run_data)
         print(f'Run saved to "{run_path}"')
 
-        # safe rewrite of the results
-        write_json_atomic(records_path, case_records)
-        print(f'Records saved to "{records_path}"')
+        # fold the records log into the records file once it grows too large
+        records_log.close()
+        if compact_records_log(records_path, records_log_path, case_records):
+            print(f'Records compacted to "{records_path}"')
+        else:
+            print(f'Records appended to "{records_log_path}"')
 
     except Exception as e:
         print(f"Failed to save the run due to the exception: {e}")
\ No newline at end of file
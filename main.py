@@ -1,35 +1,47 @@
 import os
-
-import regex as re
+import queue
+import threading
 
 from collections import Counter
-from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields, replace
 from datetime import datetime
 from dotenv import load_dotenv
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-from src.export import export_run_to_excel
+from src.browser_pool import block_page_assets, clone_session, map_on_idle_drivers, quit_driver
+from src.extract import get_case_details, get_result_rows
 from src.schemas import CaseSearchConfig, CourtCase
 from src.search import build_search_ranges, get_search_coverage, search_for_cases
 from src.utils import (
     prompt_for_date_range,
     parse_init_action,
-    extract_span_texts,
+    append_record,
+    compact_records_log,
     load_records,
+    load_records_log,
+    open_append_log,
     lookup_court_case,
     sleepy_click,
     write_json_atomic,
 )
 
 
+# page locators
+_RESULTS_GRID = (By.ID, "grid")
+_NEXT_PAGE_LINK = (By.XPATH, "//a[@title='Go to next page']")
+_HOME_LINK = (By.LINK_TEXT, "Home")
+_SEARCH_BUTTON = (By.CSS_SELECTOR, "a.anchorButton.welcome-section")
+
 # environment variables
 load_dotenv()
 
@@ -43,6 +55,12 @@ results_per_page = os.getenv("RESULTS_PER_PAGE")
 # allow for update_seen to be unset
 update_seen = os.getenv("UPDATE_SEEN", "")
 
+# extra browsers loading "Case Details" pages alongside the main driver
+detail_workers = os.getenv("DETAIL_WORKERS")
+
+# number of browsers searching date ranges at the same time
+max_concurrency = os.getenv("MAX_CONCURRENCY")
+
 try:
     # format the jitter factor
     jitter_factor = float(jitter_factor)
@@ -60,6 +78,7 @@ timeout = 15  # seconds
 fast_timeout = 5  # seconds
 min_sleep = 3  # seconds
 max_sleep = min_sleep + (min_sleep * jitter_factor)
+poll_frequency = 0.1  # seconds between checks while waiting on a page
 
 date_input_format = "%m/%d/%Y"
 start_date, end_date = prompt_for_date_range()
@@ -69,11 +88,24 @@ try:
 except Exception:
     update_seen = False
 
+try:
+    detail_workers = max(0, int(detail_workers))
+except (TypeError, ValueError):
+    # defaults to 0, details are loaded by the main driver
+    detail_workers = 0
+
+try:
+    max_concurrency = max(1, int(max_concurrency))
+except (TypeError, ValueError):
+    # defaults to a single browser
+    max_concurrency = 1
+
 # load records
 data_dir = Path(data_dir_path or "data")
 data_dir.mkdir(parents=True, exist_ok=True)
 
 records_path = data_dir / "records.json"
+records_log_path = data_dir / "records.jsonl"
 
 runs_dir = data_dir / "runs"
 runs_dir.mkdir(parents=True, exist_ok=True)
@@ -100,6 +132,7 @@ output_path = outputs_dir / f"{run_name}.xlsx"
 
 # load existing records
 case_records = load_records(records_path)
+case_records.update(load_records_log(records_log_path))
 print(f"Loaded {len(list(case_records.keys()))} existing case records")
 if update_seen:
     print("Previously seen cases will be update (if possible)")
@@ -120,99 +153,143 @@ run_data = {
     "results": {},  # mapping: case_number (str) -> result fields for this run
 }
 
-# access the website
-driver = webdriver.Chrome()
-driver.get(website_url)
+# new and updated records are appended as they are scraped
+records_log = open_append_log(records_log_path)
 
-# rely on user to complete recaptcha
-print("Please prove that you're not a robot")
-try:
-    WebDriverWait(driver, 180).until(
-        EC.url_contains("search.page")
-    )
-    print("Human verification completed successfully")
-except TimeoutException:
-    print("Human verification was not completed within the tme limit")
-    driver.close()
+# the printed case boxes always share the same keys
+case_key_width = max(len(f.name) for f in fields(CourtCase))
 
-# primary search configuration
-main_search_config = CaseSearchConfig(
-    court_departments = ["Housing Court"],
-    court_divisions=["Northeast Housing Court"],
-    court_locations=["Northeast Housing Court"],
-    results_per_page=results_per_page,
-    start_date=start_date,
-    end_date=end_date,
-    case_types=["Housing Court Summary Process"],
-    cities=["All Cities"],
-    statuses=["Active"],
-    party_types=["Defendant"],
-    min_sleep=min_sleep,
-    max_sleep=max_sleep,
-)
-search_config_dict = main_search_config.to_dict()
+# guards the run's records, shared by the date range threads
+records_lock = threading.Lock()
 
-# printing search configurations
-exclude_from_print = {"results_per_page", "min_sleep", "max_sleep"}
-defer_print = {"start_date", "end_date"}
+# worker drivers not currently loading a "Case Details" page
+idle_workers: "queue.Queue[WebDriver]" = queue.Queue()
 
-print("Search Configurations:")
 
-# print all except excluded + deferred
-for key, value in search_config_dict.items():
-    if key in exclude_from_print or key in defer_print:
-        continue
-    title = key.replace("_", " ").title()
-    if isinstance(value, list):
-        value = ", ".join(value)
-    print(f"    {title}: {value}")
+def scrape_case_details(driver: WebDriver, court_case: CourtCase, case_url: str) -> CourtCase:
+    """Open a "Case Details" page and fill in the address and parties of `court_case`.
 
-# print start_date and end_date at the end
-for key in ("start_date", "end_date"):
-    if key in search_config_dict:
-        title = key.replace("_", " ").title()
-        value = search_config_dict[key]
-        if isinstance(value, list):
-            value = ", ".join(value)
-        print(f"    {title}: {value}")
+    Parameters
+    ----------
+    driver : WebDriver
+        Selenium webdriver with a verified session.
 
-search_for_cases(driver, main_search_config, timeout)
+    court_case : CourtCase
+        Case to update in place.
 
-# ensure we maximize the number of cases we can extract from the search
-coverage = get_search_coverage(driver, timeout)
-print(f"{coverage:.2%} of resulting cases from the query are accessible.")
+    case_url : str
+        Link to the case's "Case Details" page.
 
-search_date_ranges = build_search_ranges(start_date, end_date, coverage)
+    Returns
+    -------
+    CourtCase
+        The updated `court_case`.
 
-if len(search_date_ranges) > 1:
-    print("The following dates will be queried indvidually to maximize coverage:")
-    for start_date, _ in search_date_ranges:
-        print(f"    {start_date}")
+    """
+    try:
+        # visit the "Case Detail" page
+        driver.get(case_url)  # this should always be fresh, not stored
+
+        # read the address and parties in one round-trip
+        details = get_case_details(driver, fast_timeout)
+    except WebDriverException as e:
+        # page load timeouts included, leave the case's fields unchanged
+        print(f"[!] Case detail extraction failed for {court_case.case_number}: {e}")
+        details = {}
+    if "address" in details:
+        court_case.address = details["address"]
+        court_case.zipcode = details["zipcode"]
+    if "plaintiff" in details:
+        court_case.plaintiff = details["plaintiff"]
+        court_case.defendant = details["defendant"]
+
+    return court_case
+
+
+def scrape_in_new_tab(driver: WebDriver, court_case: CourtCase, case_url: str) -> CourtCase:
+    """Scrape a "Case Details" page in a throwaway tab, leaving the results grid loaded.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Selenium webdriver, currently on a search results page.
+
+    court_case : CourtCase
+        Case to update in place.
+
+    case_url : str
+        Link to the case's "Case Details" page.
+
+    Returns
+    -------
+    CourtCase
+        The updated `court_case`.
+
+    """
+    results_window = driver.current_window_handle
+    driver.switch_to.new_window("tab")
+    try:
+        return scrape_case_details(driver, court_case, case_url)
+    finally:
+        # closing the tab avoids re-rendering the grid with driver.back()
+        driver.close()
+        driver.switch_to.window(results_window)
+
+
+def scrape_with_idle_worker(job: Tuple[CourtCase, str]) -> CourtCase:
+    """Borrow an idle worker driver and scrape the details of one case with it."""
+    court_case, case_url = job
+    worker = idle_workers.get()
+    try:
+        return scrape_case_details(worker, court_case, case_url)
+    finally:
+        idle_workers.put(worker)
+
+
+def scrape_range(range_driver: WebDriver, search_start_date: str, search_end_date: str, search_again: bool) -> None:
+    """Scrape every results page of one date range and record the cases found.
+
+    Parameters
+    ----------
+    range_driver : WebDriver
+        Selenium webdriver with a verified session.
+
+    search_start_date : str
+        First day of the range (mm/dd/yyyy).
+
+    search_end_date : str
+        Last day of the range (mm/dd/yyyy).
+
+    search_again : bool
+        Whether to start a fresh search, otherwise the current results are used.
+
+    """
+    wait = waits[range_driver]
+    fast_wait = fast_waits[range_driver]
 
-for search_start_date, search_end_date in search_date_ranges:
     # only cycle through search if the date range was expanded, otherwise keep current search
-    if len(search_date_ranges) > 1:
+    if search_again:
         # we need to search again, go back to home
-        home_link = WebDriverWait(driver, timeout).until(
+        home_link = wait.until(
             # using link text
-            EC.element_to_be_clickable((By.LINK_TEXT, "Home"))
+            EC.element_to_be_clickable(_HOME_LINK)
         )
         sleepy_click(home_link, min_sleep, max_sleep)
 
         # click the search button to begin a fresh search
-        search_button = WebDriverWait(driver, timeout).until(
+        search_button = wait.until(
             # using link text
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "a.anchorButton.welcome-section"))
+            EC.element_to_be_clickable(_SEARCH_BUTTON)
         )
         sleepy_click(search_button, min_sleep, max_sleep)
 
         # update search config with 
         search_config = replace(main_search_config, start_date=search_start_date, end_date=search_end_date)
-        search_for_cases(driver, search_config, timeout)
+        search_for_cases(range_driver, search_config, timeout)
 
-    # log the coverage
+    # log the coverage (the initial search was already measured)
     run_data["coverage"][search_start_date] = {
-        "factor": get_search_coverage(driver, timeout),
+        "factor": get_search_coverage(range_driver, timeout) if search_again else coverage,
         "start_date": search_start_date,
         "end_date": search_end_date,
     }
@@ -221,147 +298,77 @@ for search_start_date, search_end_date in search_date_ranges:
     while keep_alive:
         try:
             # parse search results
-            results_table = WebDriverWait(driver, fast_timeout).until(
-                EC.presence_of_element_located((By.ID, "grid"))
+            results_table = fast_wait.until(
+                EC.presence_of_element_located(_RESULTS_GRID)
             )
-            table_body = results_table.find_element(By.TAG_NAME, "tbody")
-            cards = table_body.find_elements(By.TAG_NAME, "tr")
-        except (TimeoutException, NoSuchElementException):
+        except TimeoutException:
             keep_alive = False
             print(f"No results found for date range {search_start_date} to {search_end_date}")
             break  # leave loop, no results found
 
+        # every well-formed row in one round-trip, the grid is read at a single instant
+        rows = get_result_rows(range_driver)
+        time_now = datetime.now(tz_info).strftime(run_time_format)
+
         case_list: List[Tuple[CourtCase, str]] = []
-        for card in cards:
-            card_components = card.find_elements(By.TAG_NAME, "td")
-            try:
-                # case link store in 3rd column, listed as "Case Number"
-                case_link = card_components[3]
-                case_url = case_link.find_element(By.TAG_NAME, "a").get_attribute("href")
-                case_number = case_link.text.strip()
-
-                # creation time
-                time_now = datetime.now(tz_info).strftime(run_time_format)
-
-                # check if we've seen this case before
-                if lookup_court_case(case_records, case_number):
+        page_numbers = set()
+        duplicate_count = 0
+        with records_lock:
+            for row in rows:
+                case_number = row["case_number"]
+                case_url = row["href"]
+
+                # count every repeated listing of a case_number on this page (as crook.py does)
+                if case_number in page_numbers:
+                    duplicate_count += 1
+                    continue
+
+                # check if we've seen this case before, skip it unless we want to update
+                seen = lookup_court_case(case_records, case_number)
+                if seen and not update_seen:
+                    continue
+                page_numbers.add(case_number)
+
+                # already loaded from an earlier page or date range in this run
+                if case_number in scheduled:
+                    continue
+                scheduled.add(case_number)
+
+                if seen:
                     # create an instance of the case
                     seen_case = CourtCase(**case_records[case_number])
                     # update parameters
                     seen_case.status = "seen"
                     seen_case.updated_at = time_now
-                    # add to case_list if we want to update
-                    if update_seen:
-                        case_list.append((seen_case, case_url))
-                    # skip to next card
+                    case_list.append((seen_case, case_url))
                     continue
 
                 # create a CourtCase instance and add it to the list
                 case_obj = CourtCase(
-                    case_number = case_link.text.strip(),
+                    case_number = case_number,
                     status = "new",
-                    file_date = card_components[5].text.strip(),
-                    primary_party = card_components[2].text.strip(),
+                    file_date = row["file_date"],
+                    primary_party = row["primary_party"],
                     defendant = "",
                     plaintiff = "",
-                    init_action = parse_init_action(card_components[6].text.strip()),
+                    init_action = parse_init_action(row["init_action"]),
                     address= None,
                     zipcode=None,
                     created_at=time_now,
                     updated_at=time_now,
                 )
                 case_list.append((case_obj, case_url))
-            except (IndexError, TimeoutException):
-                # result does not match format, skip
-                continue
 
-        # pull out the CourtCase objects, then count duplicate case_numbers
-        duplicate_case_count = len([
-            n for n, cnt in Counter([c.case_number for c, _ in case_list]).items()
-            if cnt > 1
-        ])
-        run_data["counts"]["skipped"] += duplicate_case_count
+            run_data["counts"]["skipped"] += duplicate_count
 
         # to avoid stale links, we grab all the data from the page then cycle over the links
-        for court_case, fresh_url in case_list:
-            # skip if we've already recorded this case_number in this run
-            if court_case.case_number in run_data["results"]:
-                continue
-
-            # visit each "Case Detail" page
-            driver.get(fresh_url)  # this should always be fresh, not stored
-
-            try:
-                # parse out the property address
-                address_container = WebDriverWait(driver, fast_timeout).until(
-                    EC.presence_of_element_located((By.ID, "addressInfo"))
-                )
-                address_rows = address_container.find_elements(By.TAG_NAME, "div")
-
-                # need at least two rows to hold street, city, state, and zipcode
-                street_parts = extract_span_texts(address_rows[0])  # i.e. ["23", "Prince", "Street", "9"]
-                place_parts = extract_span_texts(address_rows[1])  # i.e. ["Danvers", "MA", "01923"]
-
-                # city, state zIP — tolerate missing pieces and stray spacing
-                city = place_parts[0] if len(place_parts) >= 1 else ""
-                state = place_parts[1] if len(place_parts) >= 2 else ""
-                zipc = place_parts[2] if len(place_parts) >= 3 else ""
-            
-                # combined strings
-                line1 = " ".join(street_parts)
-                line2 = ", ".join(filter(None, [city, state])) + (f" {zipc}" if zipc else "")
-                full_address = f"{line1}, {line2}" if line2 else line1
-
-                # update address
-                court_case.address = full_address
-                court_case.zipcode = zipc
-
-            except (KeyError, IndexError, TimeoutException, NoSuchElementException):
-                # don't update address
-                pass
-
-            try:
-                # parse out plaintiff and defendant
-                party_info_container = WebDriverWait(driver, timeout).until(
-                    EC.presence_of_element_located((By.ID, "ptyContainer"))
-                )
-
-                # Only consider DIRECT child rows of #ptyContainer (rowodd/roweven)
-                party_blocks = party_info_container.find_elements(
-                    By.XPATH, "./div[starts-with(@class,'row')]"
-                )
-
-                first_plaintiff: Optional[str] = None
-                first_defendant: Optional[str] = None
-
-                for block in party_blocks:
-                    try:
-                        # name/role live inside the subSectionHeader2 header
-                        header = block.find_element(By.CLASS_NAME, "subSectionHeader2")
-                        name = header.find_element(By.CLASS_NAME, "ptyInfoLabel").text.strip()
-                        role_raw = header.find_element(By.CLASS_NAME, "ptyType").text
-                    except NoSuchElementException:
-                        continue
-
-                    # normalize role text like " - Plaintiff"
-                    role = re.sub(r"\s|-", " ", role_raw).strip().lower()
-
-                    if ("plaintiff" in role) and (first_plaintiff is None):
-                        first_plaintiff = name
-                    if ("defendant" in role) and (first_defendant is None):
-                        first_defendant = name
-
-                    if first_plaintiff and first_defendant:
-                        break
-
-                # update the case
-                court_case.plaintiff = first_plaintiff
-                court_case.defendant = first_defendant
-
-            except (TimeoutException, NoSuchElementException):
-                # don't update
-                pass
+        if detail_executor is not None:
+            # worker drivers load the detail pages, the main driver stays on the results
+            scraped_cases = detail_executor.map(scrape_with_idle_worker, case_list)
+        else:
+            scraped_cases = (scrape_in_new_tab(range_driver, court_case, fresh_url) for court_case, fresh_url in case_list)
 
+        for court_case in scraped_cases:
             if update_seen and (court_case.status == "seen"):
                 # update metadata for previously seen cases
                 court_case.status = "updated"
@@ -369,38 +376,154 @@ for search_start_date, search_end_date in search_date_ranges:
 
             # record the court case
             case_dict = court_case.to_dict()
-            run_data["results"][court_case.case_number] = case_dict
-            case_records[court_case.case_number] = case_dict
-
-            # pretty print the case
-            max_key_len = max(len(k) for k in case_dict)
-            # print "None" for None values
-            max_val_len = max(len(str(v) if v is not None else "None") for v in case_dict.values())
-            box_width = max_key_len + max_val_len + 5
-
-            print("+" + ("-" * box_width) + "+")
-            for k, v in case_dict.items():
-                val_str = str(v) if v is not None else "None"
-                print(f"| {k:<{max_key_len}} : {val_str:<{max_val_len}} |")
-            print("+" + ("-" * box_width) + "+")
-
-            # leave the case detail page
-            driver.back()
+            with records_lock:
+                run_data["results"][court_case.case_number] = case_dict
+                case_records[court_case.case_number] = case_dict
+                append_record(records_log, case_dict)
+
+            # pretty print the case (str(None) already reads "None")
+            val_strs = [str(v) for v in case_dict.values()]
+            max_val_len = max(map(len, val_strs))
+            border = "+" + ("-" * (case_key_width + max_val_len + 5)) + "+"
+
+            lines = [border]
+            lines.extend(
+                f"| {k:<{case_key_width}} : {val_str:<{max_val_len}} |"
+                for k, val_str in zip(case_dict, val_strs)
+            )
+            lines.append(border)
+            print("\n".join(lines))
 
         # attempt to access more results
         try:
             # wait until the "next page" button is clickable
-            next_page_btn = WebDriverWait(driver, timeout).until(
-                EC.element_to_be_clickable((By.XPATH, "//a[@title='Go to next page']"))
+            next_page_btn = wait.until(
+                EC.element_to_be_clickable(_NEXT_PAGE_LINK)
+            )
+            # jitter before navigating, then move on as soon as the old grid is gone
+            sleepy_click(next_page_btn, min_sleep, max_sleep, after=False)
+            wait.until(
+                EC.staleness_of(results_table)
             )
-            sleepy_click(next_page_btn, min_sleep, max_sleep)
         except TimeoutException:
             print("Results exhausted.")
             keep_alive = False
             break
 
-# shutdown the driver
-driver.close()
+
+def scrape_range_again(range_driver: WebDriver, search_range: Tuple[str, str]) -> None:
+    """Run a fresh search for `search_range` on `range_driver` and scrape it."""
+    scrape_range(range_driver, *search_range, search_again=True)
+
+
+# access the website
+driver = webdriver.Chrome()
+driver.get(website_url)
+
+# rely on user to complete recaptcha
+print("Please prove that you're not a robot")
+try:
+    WebDriverWait(driver, 180).until(
+        EC.url_contains("search.page")
+    )
+    print("Human verification completed successfully")
+except TimeoutException:
+    print("Human verification was not completed within the tme limit")
+    quit_driver(driver)
+
+# waits are reused for every lookup, keyed by driver for the date range threads
+waits: Dict[WebDriver, WebDriverWait] = {driver: WebDriverWait(driver, timeout, poll_frequency=poll_frequency)}
+fast_waits: Dict[WebDriver, WebDriverWait] = {driver: WebDriverWait(driver, fast_timeout, poll_frequency=poll_frequency)}
+
+# primary search configuration
+main_search_config = CaseSearchConfig(
+    court_departments = ["Housing Court"],
+    court_divisions=["Northeast Housing Court"],
+    court_locations=["Northeast Housing Court"],
+    results_per_page=results_per_page,
+    start_date=start_date,
+    end_date=end_date,
+    case_types=["Housing Court Summary Process"],
+    cities=["All Cities"],
+    statuses=["Active"],
+    party_types=["Defendant"],
+    min_sleep=min_sleep,
+    max_sleep=max_sleep,
+)
+search_config_dict = main_search_config.to_dict()
+
+# printing search configurations
+exclude_from_print = {"results_per_page", "min_sleep", "max_sleep"}
+defer_print = {"start_date", "end_date"}
+
+print("Search Configurations:")
+
+# print all except excluded + deferred
+for key, value in search_config_dict.items():
+    if key in exclude_from_print or key in defer_print:
+        continue
+    title = key.replace("_", " ").title()
+    if isinstance(value, list):
+        value = ", ".join(value)
+    print(f"    {title}: {value}")
+
+# print start_date and end_date at the end
+for key in ("start_date", "end_date"):
+    if key in search_config_dict:
+        title = key.replace("_", " ").title()
+        value = search_config_dict[key]
+        if isinstance(value, list):
+            value = ", ".join(value)
+        print(f"    {title}: {value}")
+
+# each worker gets its own driver, Selenium drivers are not thread-safe
+workers: List[WebDriver] = []
+detail_executor: Optional[ThreadPoolExecutor] = None
+if detail_workers:
+    print(f"Loading case details with {detail_workers} worker(s)")
+    for _ in range(detail_workers):
+        worker = clone_session(driver, website_url)
+        block_page_assets(worker)
+        workers.append(worker)
+        idle_workers.put(worker)
+    detail_executor = ThreadPoolExecutor(max_workers=detail_workers)
+
+search_for_cases(driver, main_search_config, timeout)
+
+# ensure we maximize the number of cases we can extract from the search
+coverage = get_search_coverage(driver, timeout)
+print(f"{coverage:.2%} of resulting cases from the query are accessible.")
+
+search_date_ranges = build_search_ranges(start_date, end_date, coverage)
+
+if len(search_date_ranges) > 1:
+    print("The following dates will be queried indvidually to maximize coverage:")
+    for start_date, _ in search_date_ranges:
+        print(f"    {start_date}")
+
+# case_numbers already queued for a detail page in this run, across pages and date ranges
+scheduled = set()
+
+if len(search_date_ranges) > 1:
+    # each range searches again, spread them over a pool of verified drivers
+    range_drivers = [driver]
+    range_drivers += [clone_session(driver, driver.current_url) for _ in range(min(max_concurrency, len(search_date_ranges)) - 1)]
+    for range_driver in range_drivers[1:]:
+        block_page_assets(range_driver)
+        waits[range_driver] = WebDriverWait(range_driver, timeout, poll_frequency=poll_frequency)
+        fast_waits[range_driver] = WebDriverWait(range_driver, fast_timeout, poll_frequency=poll_frequency)
+        workers.append(range_driver)
+
+    map_on_idle_drivers(range_drivers, scrape_range_again, search_date_ranges)
+else:
+    scrape_range(driver, *search_date_ranges[0], search_again=False)
+
+# shutdown the workers and clones, then the driver
+if detail_executor is not None:
+    detail_executor.shutdown()
+for worker in workers:
+    quit_driver(worker)
+quit_driver(driver)
 
 # save the run
 run_end_time = datetime.now(tz_info)
@@ -444,10 +567,15 @@ for date_key, cov in run_data.get("coverage", {}).items():
 write_json_atomic(run_path, run_data)
 print(f'Run saved to "{run_path}"')
 
-# safe rewrite of the results
-write_json_atomic(records_path, case_records)
-print(f'Records saved to "{records_path}"')
+# fold the records log into the records file once it grows too large
+records_log.close()
+if compact_records_log(records_path, records_log_path, case_records):
+    print(f'Records compacted to "{records_path}"')
+else:
+    print(f'Records appended to "{records_log_path}"')
+
+# export (openpyxl is only imported once the run is over)
+from src.export import export_run_to_excel
 
-# export
 export_run_to_excel(run_data, output_path)
 print(f'Output saved to "{output_path}"')
\ No newline at end of file
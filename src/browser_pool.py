@@ -0,0 +1,326 @@
+import atexit
+import queue
+import socket
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, TypeVar
+from urllib.error import URLError
+from urllib.parse import urlparse
+from urllib.request import HTTPRedirectHandler, OpenerDirector, build_opener
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# drivers started here and not yet quit, so none outlives the interpreter
+_drivers: List[WebDriver] = []
+
+# subresources the scraper never reads
+_BLOCKED_URL_PATTERNS = [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.svg",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*google-analytics*",
+    "*googletagmanager*",
+    "*doubleclick*",
+]
+
+
+class _RefuseRedirects(HTTPRedirectHandler):
+    """Turn every redirect into an HTTPError instead of following it.
+
+    A session opener's cookie header would be re-sent to whatever host the
+    redirect names, and a redirect to the verification page is a failed fetch.
+    """
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+def pin_host_rule(url: str) -> Optional[str]:
+    """Resolve the host of `url` once and return a Chrome host-resolver rule for it.
+
+    Parameters
+    ----------
+    url : str
+        Any URL on the host to pin.
+
+    Returns
+    -------
+    Optional[str]
+        Rule mapping the host to its current address (i.e. "MAP example.org 93.184.216.34"),
+        or None if the host could not be resolved.
+
+    """
+    host = urlparse(url).hostname
+    if not host:
+        return None
+
+    try:
+        return f"MAP {host} {socket.gethostbyname(host)}"
+    except OSError:
+        return None
+
+
+def build_chrome_options(profile_dir: Optional[Path] = None, pinned_url: Optional[str] = None, headless: bool = False) -> webdriver.ChromeOptions:
+    """Build Chrome options, optionally backed by a persistent user profile.
+
+    Parameters
+    ----------
+    profile_dir : Optional[Path]
+        Directory Chrome uses to persist cookies and session state.
+        Defaults to None (throwaway profile).
+
+    pinned_url : Optional[str]
+        URL whose host is resolved once up front, skipping DNS on every navigation.
+        Defaults to None.
+
+    headless : bool
+        Whether to run without a window (no use for the reCAPTCHA step).
+        Defaults to False.
+
+    Returns
+    -------
+    webdriver.ChromeOptions
+        Options for a Chrome instance that reuses `profile_dir`.
+
+    """
+    options = webdriver.ChromeOptions()
+
+    # return from get() at DOMContentLoaded, callers wait for the elements they need
+    options.page_load_strategy = "eager"
+
+    if headless:
+        options.add_argument("--headless=new")
+        # nothing is looked at, so don't decode images either
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+    if profile_dir is not None:
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        options.add_argument(f"--user-data-dir={profile_dir.resolve()}")
+        options.add_argument("--profile-directory=Default")
+
+    host_rule = pin_host_rule(pinned_url) if pinned_url else None
+    if host_rule:
+        options.add_argument(f"--host-resolver-rules={host_rule}")
+    return options
+
+
+def start_driver(profile_dir: Path, pinned_url: Optional[str] = None) -> WebDriver:
+    """Start a Chrome driver backed by the persistent profile in `profile_dir`.
+
+    The profile persists the reCAPTCHA-solved session between runs, so a
+    still-valid session cookie lets the caller skip human verification.
+    Only one Chrome can use a profile at a time, shut it down with `quit_driver`.
+
+    Parameters
+    ----------
+    profile_dir : Path
+        Directory Chrome uses to persist cookies and session state.
+
+    pinned_url : Optional[str]
+        URL whose host is resolved once when the driver starts.
+        Defaults to None.
+
+    Returns
+    -------
+    WebDriver
+        Selenium webdriver bound to the profile.
+
+    """
+    driver = webdriver.Chrome(options=build_chrome_options(profile_dir, pinned_url))
+    _drivers.append(driver)
+    return driver
+
+
+def clone_session(driver: WebDriver, url: str, headless: bool = False) -> WebDriver:
+    """Start a fresh Chrome driver that shares `driver`'s session cookies.
+
+    Lets extra browsers work alongside a verified driver without solving
+    the reCAPTCHA again.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Driver holding the verified session.
+
+    url : str
+        Page to open with the copied cookies (must share the cookies' domain).
+
+    headless : bool
+        Whether to start the clone without a window.
+        Defaults to False.
+
+    Returns
+    -------
+    WebDriver
+        Selenium webdriver on `url` with the copied session.
+
+    """
+    clone = webdriver.Chrome(options=build_chrome_options(pinned_url=url, headless=headless))
+    _drivers.append(clone)
+
+    # cookies can only be set for the domain currently loaded
+    clone.get(url)
+    for cookie in driver.get_cookies():
+        try:
+            clone.add_cookie(cookie)
+        except WebDriverException:
+            # cookie belongs to another domain, skip
+            continue
+
+    clone.get(url)
+    return clone
+
+
+def session_opener(driver: WebDriver) -> OpenerDirector:
+    """Build a urllib opener that sends requests as `driver`'s session.
+
+    Plain HTTP requests skip rendering entirely, for pages that are only
+    stored and never interacted with.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Driver holding the verified session, on the site to request.
+
+    Returns
+    -------
+    OpenerDirector
+        Opener sending the driver's cookies and user agent.
+
+    """
+    cookies = "; ".join(f"{c['name']}={c['value']}" for c in driver.get_cookies())
+    user_agent = driver.execute_script("return navigator.userAgent;")
+
+    # a redirect means the session wasn't accepted, never follow it with the cookies
+    opener = build_opener(_RefuseRedirects)
+    opener.addheaders = [("User-Agent", user_agent), ("Cookie", cookies)]
+    return opener
+
+
+def fetch_html(opener: OpenerDirector, url: str, timeout: float = 10) -> str:
+    """Fetch the HTML of `url` with a session opener.
+
+    Parameters
+    ----------
+    opener : OpenerDirector
+        Opener returned by `session_opener`.
+
+    url : str
+        Page to fetch.
+
+    timeout : float
+        Max seconds to wait for the response.
+        Defaults to 10.
+
+    Returns
+    -------
+    str
+        The page's HTML, or an empty string if the request failed or was redirected.
+
+    """
+    try:
+        with opener.open(url, timeout=timeout) as response:
+            if response.status != 200:
+                return ""
+            charset = response.headers.get_content_charset() or "utf-8"
+            return response.read().decode(charset, errors="replace")
+    except (URLError, OSError, ValueError):
+        return ""
+
+
+def block_page_assets(driver: WebDriver) -> None:
+    """Stop `driver` from downloading images, fonts and analytics scripts.
+
+    Only call this once human verification is done, the reCAPTCHA widget
+    needs its images. Stylesheets are left alone because the extracted
+    text relies on them to hide invisible elements.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Chrome driver to configure.
+
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
+
+
+def map_on_idle_drivers(drivers: List[WebDriver], func: Callable[[WebDriver, T], R], items: Iterable[T]) -> List[R]:
+    """Call `func(driver, item)` for every item, each on whichever driver is idle.
+
+    Selenium drivers are not thread-safe, so a driver only ever works on one
+    item at a time, with as many items in flight as there are drivers.
+
+    Parameters
+    ----------
+    drivers : List[WebDriver]
+        Verified drivers to spread the items over.
+
+    func : Callable[[WebDriver, T], R]
+        Work to run for a single item with the borrowed driver.
+
+    items : Iterable[T]
+        Items to work through (i.e. dates to search).
+
+    Returns
+    -------
+    List[R]
+        The results of `func`, in the order of `items`.
+
+    """
+    idle_drivers: "queue.Queue[WebDriver]" = queue.Queue()
+    for driver in drivers:
+        idle_drivers.put(driver)
+
+    def run_with_idle_driver(item: T) -> R:
+        driver = idle_drivers.get()
+        try:
+            return func(driver, item)
+        finally:
+            idle_drivers.put(driver)
+
+    with ThreadPoolExecutor(max_workers=len(drivers)) as executor:
+        # consume the results so worker exceptions are re-raised here
+        return list(executor.map(run_with_idle_driver, items))
+
+
+def quit_driver(driver: WebDriver) -> None:
+    """Shut a driver down along with its chromedriver process.
+
+    Safe to call on a driver that already quit or crashed.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Driver to shut down, started here or not.
+
+    """
+    if driver in _drivers:
+        _drivers.remove(driver)
+
+    try:
+        # quit ends chromedriver too, close would only shut the window
+        driver.quit()
+    except Exception:
+        pass
+
+
+def shutdown_drivers() -> None:
+    """Quit every driver started here that is still running (registered to run at interpreter exit)."""
+    for driver in list(_drivers):
+        quit_driver(driver)
+
+
+atexit.register(shutdown_drivers)
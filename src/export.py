@@ -1,4 +1,4 @@
-import pandas as pd
+from openpyxl import Workbook
 
 from pathlib import Path
 
@@ -6,6 +6,9 @@ from pathlib import Path
 def export_run_to_excel(run_data: dict, out_path: Path) -> None:
     """Export run_data dictionary to an Excel workbook.
 
+    Rows are streamed into a write-only workbook, so memory use stays flat
+    regardless of how many results the run collected.
+
     Parameters
     ----------
     run_data : dict
@@ -17,7 +20,6 @@ def export_run_to_excel(run_data: dict, out_path: Path) -> None:
     """
     # results dict from run_data
     results = run_data.get("results", {})
-    rows = list(results.values())
 
     # desired output column order
     desired_cols = [
@@ -31,15 +33,6 @@ def export_run_to_excel(run_data: dict, out_path: Path) -> None:
         "zipcode",
     ]
 
-    if not rows:
-        df_results = pd.DataFrame(columns=desired_cols)
-    else:
-        # create DataFrame from rows
-        df_results = pd.DataFrame(rows)
-
-        # keep only desired columns, fill in if missing
-        df_results = df_results.reindex(columns=desired_cols)
-
     # metadata
     meta = {
         "started_at": run_data.get("started_at", ""),
@@ -47,10 +40,19 @@ def export_run_to_excel(run_data: dict, out_path: Path) -> None:
         "time_elapsed": run_data.get("time_elapsed", ""),
         **{f"count_{k}": v for k, v in run_data.get("counts", {}).items()},
     }
-    df_meta = pd.DataFrame([meta])
+
+    wb = Workbook(write_only=True)
+
+    ws_results = wb.create_sheet("results")
+    ws_results.append(desired_cols)
+    for row in results.values():
+        # keep only desired columns, blank if missing
+        ws_results.append([row.get(col) for col in desired_cols])
+
+    ws_meta = wb.create_sheet("run_meta")
+    ws_meta.append(list(meta.keys()))
+    ws_meta.append(list(meta.values()))
 
     # write workbook
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with pd.ExcelWriter(out_path, engine="openpyxl") as xls:
-        df_results.to_excel(xls, sheet_name="results", index=False)
-        df_meta.to_excel(xls, sheet_name="run_meta", index=False)
+    wb.save(out_path)
@@ -0,0 +1,259 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+# whitespace and dashes in party roles, mapped to plain spaces
+_ROLE_TRANS = str.maketrans("-\t\n\r\v\f", "      ")
+
+# one row per search result and the grid's total row count, read in the browser in a single round-trip
+_RESULT_ROWS_JS = """
+const minCells = arguments[0];
+const text = (el) => (el ? el.innerText : "").trim();
+const trs = document.querySelectorAll("#grid tbody tr");
+const rows = [];
+for (const tr of trs) {
+    const cells = tr.querySelectorAll("td");
+    if (cells.length < minCells) continue;
+    const link = cells[3].querySelector("a");
+    if (!link) continue;
+    rows.push({
+        href: link.href,
+        case_number: text(cells[3]),
+        file_date: text(cells[5]),
+        primary_party: text(cells[2]),
+        init_action: text(cells[6]),
+    });
+}
+return {total: trs.length, rows: rows};
+"""
+
+# every section of the "Case Details" page, read in a single round-trip once
+# the address and party containers exist (or the deadline passes), polling in the browser
+_CASE_DETAILS_JS = """
+const timeoutMs = arguments[0];
+const done = arguments[arguments.length - 1];
+const text = (el) => (el ? el.innerText : "").trim();
+const spanTexts = (el) => Array.from(el.querySelectorAll("span")).map(text).filter((t) => t);
+const tableRows = (table) => table
+    ? Array.from(table.querySelectorAll("tbody > tr")).map((tr) => Array.from(tr.querySelectorAll("td")).map(text))
+    : [];
+
+const readCaseDetails = () => {
+    let address = null;
+    const addressInfo = document.getElementById("addressInfo");
+    if (addressInfo) {
+        const rows = addressInfo.querySelectorAll("div");
+        if (rows.length >= 2) {
+            address = {street: spanTexts(rows[0]), place: spanTexts(rows[1])};
+        }
+    }
+
+    let parties = null;
+    const ptyContainer = document.getElementById("ptyContainer");
+    if (ptyContainer) {
+        parties = [];
+        let plaintiff = false;
+        let defendant = false;
+        for (const block of ptyContainer.querySelectorAll(":scope > div[class^='row']")) {
+            // only the first plaintiff and defendant are used
+            if (plaintiff && defendant) break;
+            const header = block.querySelector(".subSectionHeader2");
+            const name = header && header.querySelector(".ptyInfoLabel");
+            const role = header && header.querySelector(".ptyType");
+            if (!name || !role) continue;
+            const lowered = role.innerText.toLowerCase();
+            const isPlaintiff = lowered.includes("plaintiff");
+            const isDefendant = lowered.includes("defendant");
+            if (!isPlaintiff && !isDefendant) continue;
+            plaintiff = plaintiff || isPlaintiff;
+            defendant = defendant || isDefendant;
+            parties.push({name: text(name), role: role.innerText});
+        }
+    }
+
+    return {
+        address: address,
+        parties: parties,
+        docket: tableRows(document.getElementById("docketInfo")),
+        dispositions: tableRows(document.getElementById("dispositionInfo")),
+        judgments: tableRows(document.querySelector(".judgementsInfo table")),
+    };
+};
+
+const deadline = Date.now() + timeoutMs;
+const poll = () => {
+    const loaded = document.getElementById("addressInfo") && document.getElementById("ptyContainer");
+    if (loaded || Date.now() >= deadline) {
+        done(readCaseDetails());
+    } else {
+        setTimeout(poll, 50);
+    }
+};
+poll();
+"""
+
+
+def get_result_page(driver: WebDriver, min_cells: int = 7) -> Tuple[int, List[Dict[str, str]]]:
+    """Read the search results grid in one WebDriver call.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Selenium webdriver, currently on a search results page.
+
+    min_cells : int
+        Cells a row needs to count as well-formed, missing cells read as empty
+        text (the case link is in the 4th cell, so at least 4).
+        Defaults to 7.
+
+    Returns
+    -------
+    Tuple[int, List[Dict[str, str]]]
+        The number of rows in the grid (well-formed or not), and one dict per
+        well-formed row with the keys "href", "case_number", "file_date",
+        "primary_party" and "init_action" (raw cell text).
+
+    """
+    page = driver.execute_script(_RESULT_ROWS_JS, min_cells) or {}
+    return page.get("total", 0), page.get("rows", [])
+
+
+def get_result_rows(driver: WebDriver, min_cells: int = 7) -> List[Dict[str, str]]:
+    """Read every well-formed row of the search results grid in one WebDriver call.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Selenium webdriver, currently on a search results page.
+
+    min_cells : int
+        Cells a row needs to count as well-formed.
+        Defaults to 7.
+
+    Returns
+    -------
+    List[Dict[str, str]]
+        Rows as returned by `get_result_page`.
+
+    """
+    return get_result_page(driver, min_cells)[1]
+
+
+def format_address(street_parts: List[str], place_parts: List[str]) -> Tuple[str, str]:
+    """Combine address span texts into a single line and a zipcode.
+
+    Parameters
+    ----------
+    street_parts : List[str]
+        Street spans, i.e. ["23", "Prince", "Street", "9"].
+
+    place_parts : List[str]
+        City, state and zipcode spans, i.e. ["Danvers", "MA", "01923"].
+
+    Returns
+    -------
+    Tuple[str, str]
+        The full address and the zipcode (empty if missing).
+
+    """
+    # city, state zIP — tolerate missing pieces and stray spacing
+    city = place_parts[0] if len(place_parts) >= 1 else ""
+    state = place_parts[1] if len(place_parts) >= 2 else ""
+    zipc = place_parts[2] if len(place_parts) >= 3 else ""
+
+    # combined strings
+    line1 = " ".join(street_parts)
+    line2 = ", ".join(filter(None, [city, state])) + (f" {zipc}" if zipc else "")
+    full_address = f"{line1}, {line2}" if line2 else line1
+
+    return full_address, zipc
+
+
+def pick_parties(parties: List[Dict[str, str]]) -> Tuple[Optional[str], Optional[str]]:
+    """Return the names of the first plaintiff and the first defendant.
+
+    Parameters
+    ----------
+    parties : List[Dict[str, str]]
+        Party rows in page order, each with a "name" and a raw "role".
+
+    Returns
+    -------
+    Tuple[Optional[str], Optional[str]]
+        (first_plaintiff, first_defendant), None where no party matched.
+
+    """
+    first_plaintiff: Optional[str] = None
+    first_defendant: Optional[str] = None
+
+    for party in parties:
+        if first_plaintiff and first_defendant:
+            break
+
+        # normalize role text like " - Plaintiff"
+        role = party["role"].translate(_ROLE_TRANS).strip().lower()
+
+        if ("plaintiff" in role) and (first_plaintiff is None):
+            first_plaintiff = party["name"]
+        if ("defendant" in role) and (first_defendant is None):
+            first_defendant = party["name"]
+
+    return first_plaintiff, first_defendant
+
+
+def get_case_details(driver: WebDriver, timeout: int = 5) -> Dict[str, Any]:
+    """Extract the structured sections of a "Case Details" page.
+
+    Waits for the address and party blocks inside the browser, then reads the
+    address, parties, docket, dispositions and judgments, all in a single
+    WebDriver call.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Selenium webdriver, currently on a "Case Details" page.
+
+    timeout : int
+        Max seconds to wait for the page to load, must stay below the
+        driver's script timeout (30 seconds unless changed).
+        Defaults to 5.
+
+    Returns
+    -------
+    Dict[str, Any]
+        CourtCase field updates. "address"/"zipcode" and "plaintiff"/"defendant"
+        are only present when their section was found on the page.
+
+    """
+    try:
+        # reads whatever sections did load once the deadline passes
+        raw = driver.execute_async_script(_CASE_DETAILS_JS, timeout * 1000) or {}
+    except TimeoutException:
+        # the script itself outlived the driver's script timeout
+        raw = {}
+    details: Dict[str, Any] = {}
+
+    address = raw.get("address")
+    if address:
+        details["address"], details["zipcode"] = format_address(address["street"], address["place"])
+
+    parties = raw.get("parties")
+    if parties is not None:
+        details["plaintiff"], details["defendant"] = pick_parties(parties)
+
+    details["docket_entries"] = [
+        {"date": cells[0], "text": cells[1]}
+        for cells in raw.get("docket", []) if len(cells) >= 2
+    ]
+    details["dispositions"] = [
+        {"disposition": cells[0], "date": cells[1]}
+        for cells in raw.get("dispositions", []) if len(cells) >= 2
+    ]
+    details["judgments"] = [
+        {"date": cells[0], "type": cells[1], "method": cells[2], "for": cells[3], "against": cells[4]}
+        for cells in raw.get("judgments", []) if len(cells) >= 5
+    ]
+
+    return details
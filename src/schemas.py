@@ -29,13 +29,34 @@ class CaseSearchConfig:
         Dict[str, Any]
             Dictionary containing all dataclass fields and values.
         """
-        return asdict(self)
+        # flat fields, copying the lists is all asdict's deep copy would buy
+        return {k: (list(v) if isinstance(v, list) else v) for k, v in self.__dict__.items()}
 
     def copy(self, **updates):
         """Return a copy of the instance with optional field overrides."""
         return replace(self, **updates)
 
 
+@dataclass(slots=True)
+class DateCoverage:
+    # results seen for the date
+    found : int = 0
+    duplicates : int = 0
+    recorded : int = 0
+    # fraction of results accessible by the query
+    accessible : float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the DateCoverage instance into a plain dictionary.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Dictionary containing all dataclass fields and values.
+        """
+        return asdict(self)
+
+
 @dataclass
 class CourtCase:
     # unique identifier
@@ -66,5 +87,6 @@ class CourtCase:
         -------
         Dict[str, Any]
             Dictionary containing all dataclass fields and values.
+            Nested sections are shared with the instance, not copied.
         """
-        return asdict(self)
+        return self.__dict__.copy()
@@ -1,11 +1,11 @@
 import regex as re
 
-from math import isclose
 from typing import List, Tuple
 
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
@@ -13,6 +13,47 @@ from src.schemas import CaseSearchConfig
 from src.utils import expand_date_range, sleepy_click, sleepy_select_visible_text, sleepy_send_keys
 
 
+# runs of digits in the results notice, i.e. "Returning 100 of 150 records."
+_NUM_RE = re.compile(r"\d+")
+
+# "selected" as a whole class token
+_SELECTED_RE = re.compile(r"(?<!\S)selected(?!\S)")
+
+
+def find_elements_by_names(driver: WebDriver, names: List[str], timeout: int = 15) -> List[WebElement]:
+    """Fetch the first element for each name attribute in a single WebDriver call.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Selenium webdriver.
+
+    names : List[str]
+        Values of the elements' name attributes.
+
+    timeout : int
+        Max seconds to wait for any element the batch didn't find.
+        Defaults to 15.
+
+    Returns
+    -------
+    List[WebElement]
+        One element per name, in order.
+
+    """
+    found = driver.execute_script(
+        "return arguments[0].map((name) => document.getElementsByName(name)[0] || null);", names
+    ) or [None] * len(names)
+
+    # fall back to waiting on whatever hasn't rendered yet
+    return [
+        element if element is not None else WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.NAME, name))
+        )
+        for name, element in zip(names, found)
+    ]
+
+
 def search_for_cases(
         driver: WebDriver,
         config: CaseSearchConfig,
@@ -60,7 +101,8 @@ def search_for_cases(
     page_size_dropdown = WebDriverWait(driver, timeout).until(
         EC.presence_of_element_located((By.NAME, "pageSize"))
     )
-    sleepy_select_visible_text(page_size_dropdown, [results_per_page], min_sleep, max_sleep, before=False)
+    # page size doesn't cascade into other dropdowns, no need to pause after it
+    sleepy_select_visible_text(page_size_dropdown, [results_per_page], min_sleep, max_sleep, before=False, after=False)
 
     # navigate to search by case type
     tab_row = WebDriverWait(driver, timeout).until(
@@ -70,11 +112,13 @@ def search_for_cases(
     selected_tab_text = ""
     for li in tab_row.find_elements(By.TAG_NAME, "li"):
         cls = li.get_attribute("class") or ""
-        if "selected" in cls.split():
+        if _SELECTED_RE.search(cls):
             try:
                 selected_tab_text = li.find_element(By.TAG_NAME, "a").text.strip()
             except NoSuchElementException:
                 selected_tab_text = ""
+            # only one tab is selected
+            break
 
     if selected_tab_text != "Case Type":
         # use LINK_TEXT to find the tab anchor
@@ -104,22 +148,19 @@ def search_for_cases(
     )
     sleepy_select_visible_text(case_type_select, case_type_selections, min_sleep, max_sleep, before=False)
 
-    city_selections = config.cities
-    city_select = WebDriverWait(driver, timeout).until(
-        EC.presence_of_element_located((By.NAME, "cityCd"))
+    # the remaining dropdowns render with the case type, fetch them in one round-trip
+    city_select, case_status_select, party_type_select = find_elements_by_names(
+        driver, ["cityCd", "statCd", "ptyCd"], timeout
     )
-    sleepy_select_visible_text(city_select, city_selections, min_sleep, max_sleep, before=False)
+
+    city_selections = config.cities
+    sleepy_select_visible_text(city_select, city_selections, min_sleep, max_sleep, before=False, after=False)
 
     case_status_selections = config.statuses
-    case_status_select = WebDriverWait(driver, timeout).until(
-        EC.presence_of_element_located((By.NAME, "statCd"))
-    )
-    sleepy_select_visible_text(case_status_select, case_status_selections, min_sleep, max_sleep, before=False)
+    sleepy_select_visible_text(case_status_select, case_status_selections, min_sleep, max_sleep, before=False, after=False)
 
     party_type_selections = config.party_types
-    party_type_select = WebDriverWait(driver, timeout).until(
-        EC.presence_of_element_located((By.NAME, "ptyCd"))
-    )
+    # one pause after the last selection covers the independent dropdowns above
     sleepy_select_visible_text(party_type_select, party_type_selections, min_sleep, max_sleep, before=False)
 
     search_btn = WebDriverWait(driver, timeout).until(
@@ -156,7 +197,7 @@ def get_search_coverage(driver: WebDriver, timeout: int = 15) -> float:
         text = notice_el.text.strip()
 
         # extract numbers with regex
-        nums = re.findall(r"\d+", text)
+        nums = _NUM_RE.findall(text)
 
         if len(nums) >= 2:
             returned, total = map(int, nums[:2])
@@ -174,6 +215,6 @@ def build_search_ranges(
     threshold: float = 0.999,  # tolerate tiny float error
 ) -> List[Tuple[str, str]]:
     """Return [(start,end)] if coverage is good enough, else [(d,d) ...]."""
-    if coverage >= threshold or isclose(coverage, 1.0, rel_tol=0, abs_tol=1e-9):
+    if coverage >= threshold:
         return [(start_date, end_date)]
     return [(d, d) for d in expand_date_range(start_date, end_date)]
\ No newline at end of file
@@ -1,3 +1,4 @@
+import gzip
 import json
 import os
 import random
@@ -6,9 +7,9 @@ import time
 
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, BinaryIO, Dict, Iterator, Tuple, Union
 
-from selenium.webdriver.common.by import By
+import orjson
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import Select
@@ -71,6 +72,189 @@ def load_records(path: Path) -> Dict[str, Dict[str, Any]]:
         return {}
 
 
+def load_records_log(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Replay an append-only JSONL records log into a dict keyed by case number.
+
+    Later lines win, so a case updated several times resolves to its latest record.
+    Malformed lines (i.e. a partial line left by a crash) are skipped.
+
+    Parameters
+    ----------
+    path : Path
+        Path object to the records log (one JSON record per line).
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        Plain dict of records keyed by case_number (str).
+
+    """
+    records: Dict[str, Dict[str, Any]] = {}
+    if not path.exists():
+        return records
+
+    with path.open("rb") as f:
+        for line in f:
+            try:
+                record = orjson.loads(line)
+                records[record["case_number"]] = record
+            except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+                continue
+    return records
+
+
+def open_append_log(path: Path) -> BinaryIO:
+    """Open a JSONL log for appending, ending a line torn by a crash first.
+
+    Without this, the next append would be glued onto the partial line and
+    the replay would drop both.
+
+    Parameters
+    ----------
+    path : Path
+        Path object to the log, created if missing.
+
+    Returns
+    -------
+    BinaryIO
+        The log opened in binary append mode, positioned at a line start.
+
+    """
+    log = path.open("a+b")
+    if log.seek(0, os.SEEK_END):
+        log.seek(-1, os.SEEK_END)
+        if log.read(1) != b"\n":
+            # the partial line stays malformed and is skipped on replay
+            log.write(b"\n")
+            log.flush()
+    return log
+
+
+def append_record(log: BinaryIO, record: Dict[str, Any]) -> None:
+    """Append a single record to an open JSONL records log and flush it.
+
+    Parameters
+    ----------
+    log : BinaryIO
+        Records log returned by `open_append_log`.
+
+    record : Dict[str, Any]
+        Record to append.
+
+    """
+    log.write(orjson.dumps(record) + b"\n")
+    log.flush()
+
+
+def load_results_log(path: Path) -> Dict[str, Any]:
+    """Replay an append-only JSONL log of keyed results into a single dict.
+
+    Each line holds a mapping (i.e. {"09/01/2025": {...}}), later lines win.
+    Malformed lines (i.e. a partial line left by a crash) are skipped.
+
+    Parameters
+    ----------
+    path : Path
+        Path object to the results log.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Plain dict of every logged result.
+
+    """
+    results: Dict[str, Any] = {}
+    if not path.exists():
+        return results
+
+    with path.open("rb") as f:
+        for line in f:
+            try:
+                results.update(orjson.loads(line))
+            except (orjson.JSONDecodeError, TypeError, ValueError):
+                continue
+    return results
+
+
+def append_result_durably(log: BinaryIO, result: Dict[str, Any]) -> None:
+    """Append a keyed result to an open JSONL log and fsync it to disk.
+
+    Parameters
+    ----------
+    log : BinaryIO
+        Results log returned by `open_append_log`.
+
+    result : Dict[str, Any]
+        Mapping to append as one line.
+
+    """
+    log.write(orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS) + b"\n")
+    log.flush()
+    os.fsync(log.fileno())  # survives a crash once this returns
+
+
+def fsync_dir(path: Path) -> None:
+    """Flush a directory's entries to disk.
+
+    Only the names of files created in the directory are made durable, not
+    their contents, so flush the files' data first (i.e. with a single
+    `os.sync()` for a whole batch). One call covers every entry created
+    since the last one.
+
+    Parameters
+    ----------
+    path : Path
+        Directory to flush.
+
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def compact_records_log(
+        records_path: Path,
+        log_path: Path,
+        records: Dict[str, Dict[str, Any]],
+        ratio: float = 2.0,
+    ) -> bool:
+    """Fold the records log into the records file once the log outgrows it.
+
+    Parameters
+    ----------
+    records_path : Path
+        Path object to the consolidated records file.
+
+    log_path : Path
+        Path object to the append-only records log.
+
+    records : Dict[str, Dict[str, Any]]
+        Every record (the records file with the log replayed on top).
+
+    ratio : float
+        Compact when the log is larger than `ratio` times the records file.
+        Defaults to 2.0.
+
+    Returns
+    -------
+    bool
+        Whether or not the log was compacted.
+
+    """
+    log_size = log_path.stat().st_size if log_path.exists() else 0
+    records_size = records_path.stat().st_size if records_path.exists() else 0
+
+    if not log_size or log_size <= records_size * ratio:
+        return False
+
+    # the records file holds everything before the log is dropped
+    write_json_atomic(records_path, records)
+    log_path.unlink()
+    return True
+
+
 def lookup_court_case(records: Dict[str, Dict[str, Any]], case_number: str) -> bool:
     """Lookup a court case in the records dictionary (keyed by case_number (str)).
 
@@ -88,13 +272,7 @@ def lookup_court_case(records: Dict[str, Dict[str, Any]], case_number: str) -> b
         Whether or not the case is present in the records dict.
 
     """
-
-    try:
-        records[case_number]
-        return True
-
-    except KeyError:
-        return False
+    return case_number in records
 
 
 def sleep_randomly(min_time: Union[int, float] = 0, max_time: Union[int, float] = 0) -> None:
@@ -109,7 +287,8 @@ def sleep_randomly(min_time: Union[int, float] = 0, max_time: Union[int, float]
         Maximum number of seconds to sleep for.
 
     """
-    time.sleep(random.uniform(*map(float, sorted((min_time, max_time)))))
+    # uniform() accepts its bounds in either order
+    time.sleep(random.uniform(min_time, max_time))
 
 
 def sleepy_click(web_element: WebElement, min_time: Union[int, float] = 0, max_time: Union[int, float] = 0, before: bool = True, after: bool = True) -> None:
@@ -168,6 +347,10 @@ def sleepy_select_visible_text(web_element: WebElement, selections: list[str], m
         Defaults to True.
 
     """
+    # nothing to select, leave the dropdown (and its defaults) untouched
+    if not selections:
+        return
+
     # wrap the web_element in a selenium select object
     select = Select(web_element)
 
@@ -261,8 +444,8 @@ def parse_init_action(text: str) -> str:
     return text
 
 
-def expand_date_range(start_date: str, end_date: str, date_format: str = "%m/%d/%Y") -> List[str]:
-    """Expand a range of date strings into a list of day strings.
+def expand_date_range(start_date: str, end_date: str, date_format: str = "%m/%d/%Y") -> Iterator[str]:
+    """Expand a range of date strings into day strings, one at a time.
     
     Note: Both input and output date strings are to be formatted in accordance with the `date_format` parameter. 
 
@@ -280,47 +463,87 @@ def expand_date_range(start_date: str, end_date: str, date_format: str = "%m/%d/
 
     Returns
     -------
-    List[str]
+    Iterator[str]
 
     Example
     -------
-    expand_date_range("09/01/2025", "09/03/2025")
+    list(expand_date_range("09/01/2025", "09/03/2025"))
     -> ["09/01/2025", "09/02/2025", "09/03/2025"]
     """
     start = datetime.strptime(start_date, date_format).date()
-    end = datetime.strptime(end_date, date_format).date()
 
-    days = []
-    current = start
-    while current <= end:
-        days.append(current.strftime(date_format))
-        current += timedelta(days=1)
-    return days
+    for i in range(count_date_range(start_date, end_date, date_format)):
+        yield (start + timedelta(days=i)).strftime(date_format)
 
 
-def extract_span_texts(web_element: WebElement) -> List[str]:
-    """Extract a list of non-empty text values from all <span> elements in a div.
+def count_date_range(start_date: str, end_date: str, date_format: str = "%m/%d/%Y") -> int:
+    """Count the days in a range of date strings, both ends included.
 
     Parameters
     ----------
-    web_element : WebElement
-        The parent web lement to search within.
+    start_date : str
+        Range start date string.
+
+    end_date : str
+        Range end date string.
+
+    date_format : str
+        Date string format.
+        Defaults to "%m/%d/%Y".
 
     Returns
     -------
-    List[str]
-        A list of strings, each the trimmed text content of a <span> element.
-        Empty or whitespace-only spans are excluded.
+    int
+        Number of days `expand_date_range` yields (0 if the range is reversed).
+
     """
-    return [s.text.strip() for s in web_element.find_elements(By.TAG_NAME, "span") if s.text.strip()]
+    start = datetime.strptime(start_date, date_format).date()
+    end = datetime.strptime(end_date, date_format).date()
+
+    return max(0, (end - start).days + 1)
 
 
 def write_json_atomic(path: Path, data: Dict[int, Dict[str, Any]]) -> None:
     """Atomically write JSON to `path` (safe on POSIX/NTFS)."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with tempfile.NamedTemporaryFile("w", delete=False, dir=path.parent, encoding="utf-8") as tmp:
-        json.dump(data, tmp, indent=2)
+    with tempfile.NamedTemporaryFile("wb", delete=False, dir=path.parent) as tmp:
+        tmp.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         tmp.flush()           # ensure bytes hit disk
         os.fsync(tmp.fileno())  # extra safety on crashes
         tmp_path = Path(tmp.name)
-    os.replace(tmp_path, path)  # atomic replace
\ No newline at end of file
+    os.replace(tmp_path, path)  # atomic replace
+
+
+def write_html(path: Path, html: str) -> None:
+    """Write an HTML string to its own gzip-compressed file.
+
+    Nothing is synced, once a batch of files is written follow up with
+    `os.sync()` for their data and `fsync_dir` for their directory entries.
+
+    Parameters
+    ----------
+    path : Path
+        File to write, its parent directory must exist.
+
+    html : str
+        Page source to store.
+
+    """
+    path.write_bytes(gzip.compress(html.encode("utf-8"), 6))
+
+
+def read_html(path: Path) -> str:
+    """Reverse `write_html`.
+
+    Parameters
+    ----------
+    path : Path
+        File written by `write_html`.
+
+    Returns
+    -------
+    str
+        The original page source.
+
+    """
+    return gzip.decompress(path.read_bytes()).decode("utf-8")
@@ -1,204 +1,415 @@
 import os
-import time
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Tuple
 
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from src.browser_pool import (
+    block_page_assets,
+    clone_session,
+    fetch_html,
+    map_on_idle_drivers,
+    quit_driver,
+    session_opener,
+    start_driver,
+)
+from src.extract import get_result_page
 from src.schemas import CaseSearchConfig
 from src.search import search_for_cases
 from src.utils import (
+    append_result_durably,
+    count_date_range,
     expand_date_range,
+    fsync_dir,
     load_records,
+    load_results_log,
+    open_append_log,
     prompt_for_date_range,
+    write_html,
     write_json_atomic,
 )
 
-# environment variables
-load_dotenv()
-
-website_url = os.getenv("WEBSITE_URL")
-data_dir_path = os.getenv("DATA_DIR")
+# page locators
+_SEARCH_RESULTS_LINK = (By.CSS_SELECTOR, "a[title='Search Results']")
+_NEXT_PAGE_LINK = (By.CSS_SELECTOR, "a[title='Go to next page']")
 
 # config
 timeout = 5
+poll_frequency = 0.1  # seconds between checks while waiting on a page
+verified_timeout = 5  # seconds to wait for a persisted session before asking for the recaptcha
 
-start_date, end_date = prompt_for_date_range()
-
-main_search_config = CaseSearchConfig(
-    court_departments=["Housing Court"],
-    court_divisions=["Northeast Housing Court"],
-    court_locations=["Northeast Housing Court"],
-    results_per_page="75",
-    start_date=start_date,
-    end_date=end_date,
-    case_types=["Housing Court Summary Process"],
-    cities=["All Cities"],
-    statuses=["Active", "Closed"],
-    party_types=["Plaintiff"],
-    min_sleep=1,
-    max_sleep=2,
-)
-search_config_dict = main_search_config.to_dict()
+# guards the verbose log, shared by the date threads
+verbose_log_lock = threading.Lock()
 
-dates_to_search = expand_date_range(
-    main_search_config.start_date, main_search_config.end_date
-)
 
-# create a record of verbose runs
-data_dir = Path(data_dir_path or "data")
-data_dir.mkdir(parents=True, exist_ok=True)
-
-verbose_path = data_dir / "verbose.json"
-
-# load existing records (overlapping dates will be overwritten)
-results = load_records(verbose_path)
-
-# configure the webdriver and access the website
-options = webdriver.ChromeOptions()
-options.add_argument("--incognito")
-driver = webdriver.Chrome(options=options)
-driver.get(website_url)
-
-print("Please prove that you're not a robot")
-try:
-    # wait for user to complete recaptcha
-    WebDriverWait(driver, 180).until(EC.url_contains("search.page"))
-    print("Human verification completed successfully")
-except TimeoutException:
-    print("Human verification was not completed within the tme limit")
-    driver.close()
-
-try:
-    for search_date in dates_to_search:
-        # single day search
-        start_date = search_date
-        end_date = search_date
-
-        # initialize a dated record
-        dated_data = {
-            "counts": {
-                "found": 0,
-                "skipped": 0,
-            },
-            "cases": {},
-        }
-
-        # create a new search config that spans only a single day
-        temp_search_config = main_search_config.copy(
-            start_date=search_date,
-            end_date=search_date,
+def get_page_source(driver: WebDriver, url: str) -> str:
+    """Load `url` in the browser and return its HTML.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Selenium webdriver with a verified session.
+
+    url : str
+        Case page to load.
+
+    Returns
+    -------
+    str
+        The rendered HTML, or an empty string if the page failed to load.
+
+    """
+    try:
+        driver.get(url)
+        try:
+            # the address block is present once the case has rendered
+            WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(
+                EC.presence_of_element_located((By.ID, "addressInfo"))
+            )
+        except TimeoutException:
+            # keep whatever did load
+            pass
+        return driver.page_source
+    except Exception:
+        # default to an empty string
+        return ""
+
+
+def scrape_date(
+        driver: WebDriver,
+        search_date: str,
+        search_config: CaseSearchConfig,
+        results: Dict[str, Any],
+        verbose_log: BinaryIO,
+        fetch_executor: ThreadPoolExecutor,
+        cases_dir: Path,
+    ) -> None:
+    """Search a single day and record the HTML of every case found.
+
+    Parameters
+    ----------
+    driver : WebDriver
+        Selenium webdriver with a verified session, on the search page.
+
+    search_date : str
+        Day to search (mm/dd/yyyy).
+
+    search_config : CaseSearchConfig
+        Search configurations, the dates are replaced by `search_date`.
+
+    results : Dict[str, Any]
+        Verbose results keyed by date, updated in place.
+
+    verbose_log : BinaryIO
+        Log each finished date is appended to.
+
+    fetch_executor : ThreadPoolExecutor
+        Pool used to request case pages.
+
+    cases_dir : Path
+        Directory each date's case pages are written under.
+
+    """
+    # initialize a dated record
+    dated_data = {
+        "counts": {
+            "found": 0,
+            "skipped": 0,
+        },
+        # cases map to the file holding their HTML, read back with read_html
+        "_encoding": "gzip",
+        "cases": {},
+    }
+
+    # one directory per date (yyyy-mm-dd, dates can't hold slashes on disk)
+    date_dir = cases_dir / datetime.strptime(search_date, "%m/%d/%Y").strftime("%Y-%m-%d")
+    date_dir.mkdir(parents=True, exist_ok=True)
+
+    # create a new search config that spans only a single day
+    temp_search_config = search_config.copy(
+        start_date=search_date,
+        end_date=search_date,
+    )
+    try:
+        # search for the cases
+        search_for_cases(driver, temp_search_config)
+    except Exception as e:
+        print(
+            f"Unable to configure search for {search_date}, due to the exception {e}"
         )
+        return
+
+    keep_alive = True
+    while keep_alive:
         try:
-            # search for the cases
-            search_for_cases(driver, temp_search_config)
-            time.sleep(3)
-        except Exception as e:
-            print(
-                f"Unable to configure search for {search_date}, due to the exception {e}"
+            # parse search results
+            results_table = WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(
+                EC.presence_of_element_located((By.ID, "grid"))
             )
-            continue
+        except TimeoutException:
+            print(f"No results found for date {search_date}")
+            break  # leave loop, no results found
+
+        # read the page in a single round-trip, the row count and the well-formed rows
+        # (only the case link is used, so any row reaching the 4th cell counts)
+        row_count, rows = get_result_page(driver, min_cells=4)
+
+        # assumes we've found some form of result, rows that don't match the format are skipped
+        dated_data["counts"]["found"] += row_count
+        dated_data["counts"]["skipped"] += row_count - len(rows)
+
+        case_list: List[Tuple[str, str]] = []
+        case_numbers = set()
+        for row in rows:
+            case_number = row["case_number"]
 
-        keep_alive = True
-        while keep_alive:
-            try:
-                # parse search results
-                results_table = WebDriverWait(driver, timeout).until(
+            if case_number in case_numbers:
+                # we've seen it before on this date, skip
+                dated_data["counts"]["skipped"] += 1
+                continue
+
+            case_numbers.add(case_number)
+            case_list.append((case_number, row["href"]))
+
+        # fetch case pages over plain HTTP as the driver's session, the driver stays on the results
+        opener = session_opener(driver)
+        fetched = fetch_executor.map(partial(fetch_html, opener, timeout=timeout), [url for _, url in case_list])
+        left_results = False
+        for (case_num, fresh_url), html_str in zip(case_list, fetched):
+            if not html_str:
+                # fall back to the browser
+                html_str = get_page_source(driver, fresh_url)
+                left_results = True
+
+            # always record, written straight to disk so memory stays flat across the run
+            case_path = date_dir / f"{case_num.replace('/', '-')}.html.gz"
+            write_html(case_path, html_str)
+            dated_data["cases"][case_num] = str(case_path)
+
+        # attempt to access more results
+        try:
+            if left_results:
+                driver.find_element(*_SEARCH_RESULTS_LINK).click()
+                results_table = WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(
                     EC.presence_of_element_located((By.ID, "grid"))
                 )
-                table_body = results_table.find_element(By.TAG_NAME, "tbody")
-                cards = table_body.find_elements(By.TAG_NAME, "tr")
-            except (TimeoutException, NoSuchElementException):
-                print(f"No results found for date {search_date}")
-                continue  # leave iteration, no results found
-
-            # go over the card components
-            case_list: List[Tuple[str, str]] = []
-            case_numbers = []
-            for card in cards:
-                # assumes we've found some form of result
-                dated_data["counts"]["found"] += 1
-                try:
-                    card_components = card.find_elements(By.TAG_NAME, "td")
-                    # case links are stored in 3rd column, listed as "Case Number"
-                    case_link = card_components[3]
-                    case_url = case_link.find_element(By.TAG_NAME, "a").get_attribute(
-                        "href"
-                    )
-                    case_number = case_link.text.strip()
-                except (IndexError, TimeoutException, NoSuchElementException):
-                    # result does not match format, skip
-                    dated_data["counts"]["skipped"] += 1
-                    continue
-
-                if case_number in case_numbers:
-                    # we've seen it before on this date, skip
-                    dated_data["counts"]["skipped"] += 1
-                    continue
-
-                case_numbers.append(case_number)
-                case_list.append((case_number, case_url))
-
-            for case_num, fresh_url in case_list:
-                # default to an empty string
-                html_str = ""
-                try:
-                    driver.get(fresh_url)
-                    html_str = driver.page_source
-                    time.sleep(1.5)
-                except Exception:
-                    pass
-                finally:
-                    # always record
-                    dated_data["cases"][case_num] = html_str
-
-            # attempt to access more results
-            try:
-                driver.find_element(By.XPATH, "//a[@title='Search Results']").click()
-                time.sleep(3)
-                driver.find_element(By.XPATH, "//a[@title='Go to next page']").click()
-                time.sleep(3)
-            except (TimeoutException, Exception):
-                print("Results exhausted.")
-                keep_alive = False
-                break
-
-        # record dated results
-        results[search_date] = dated_data
-        print(f"Successfully recorded the results for {search_date}")
-
-        # go back home to start the next search
-        WebDriverWait(driver, timeout).until(
-            # using link text
-            EC.element_to_be_clickable((By.LINK_TEXT, "Home"))
-        ).click()
-
-        # click the search button to begin a fresh search
-        WebDriverWait(driver, timeout).until(
-            # using link text
-            EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "a.anchorButton.welcome-section")
+            driver.find_element(*_NEXT_PAGE_LINK).click()
+            # the grid is replaced once the next page has loaded
+            WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(
+                EC.staleness_of(results_table)
             )
-        ).click()
-        time.sleep(1.5)
-except Exception as e:
-    print(f"Run failed due to the exception: {e}")
-finally:
+        except (TimeoutException, Exception):
+            print("Results exhausted.")
+            keep_alive = False
+            break
+
+    # one barrier per date before the log points at the case files,
+    # their data is flushed together, then their directory entries
+    os.sync()
+    fsync_dir(date_dir)
+
+    # record dated results
+    results[search_date] = dated_data
+    with verbose_log_lock:
+        append_result_durably(verbose_log, {search_date: dated_data})
+    print(f"Successfully recorded the results for {search_date}")
+
+    # go back home to start the next search
+    WebDriverWait(driver, timeout).until(
+        # using link text
+        EC.element_to_be_clickable((By.LINK_TEXT, "Home"))
+    ).click()
+
+    # click the search button to begin a fresh search
+    WebDriverWait(driver, timeout).until(
+        # using link text
+        EC.element_to_be_clickable(
+            (By.CSS_SELECTOR, "a.anchorButton.welcome-section")
+        )
+    ).click()
+
+
+def skip_cached_dates(dates: Iterable[str], results: Dict[str, Any]) -> Iterator[str]:
+    """Yield the dates that don't already have recorded cases.
+
+    Parameters
+    ----------
+    dates : Iterable[str]
+        Days to search (mm/dd/yyyy).
+
+    results : Dict[str, Any]
+        Verbose results keyed by date, from previous runs.
+
+    Returns
+    -------
+    Iterator[str]
+        The dates still to be scraped, dates that found nothing are retried.
+
+    """
+    for search_date in dates:
+        if results.get(search_date, {}).get("counts", {}).get("found", 0) > 0:
+            print(f"Skipping cached {search_date}")
+            continue
+        yield search_date
+
+
+def main() -> None:
+    """Scrape the HTML of every case filed in a prompted date range, one day at a time."""
+    # environment variables
+    load_dotenv()
+
+    website_url = os.getenv("WEBSITE_URL")
+    data_dir_path = os.getenv("DATA_DIR")
+    max_concurrency = os.getenv("MAX_CONCURRENCY")
+
+    # case pages requested at the same time, across all dates
+    fetch_workers = os.getenv("FETCH_WORKERS")
+
+    # allow for headless to be unset
+    headless = os.getenv("HEADLESS", "")
+
+    # re-scrape dates already recorded by a previous run
+    force_rescrape = os.getenv("FORCE_RESCRAPE", "")
+
+    try:
+        max_concurrency = max(1, int(max_concurrency))
+    except (TypeError, ValueError):
+        # defaults to a single browser
+        max_concurrency = 1
+
+    try:
+        fetch_workers = max(1, int(fetch_workers))
+    except (TypeError, ValueError):
+        # defaults to one request at a time
+        fetch_workers = 1
+
     try:
+        headless = headless.strip().lower() in {"true", "yes", "y"}
+    except Exception:
+        headless = False
+
+    try:
+        force_rescrape = force_rescrape.strip().lower() in {"true", "yes", "y"}
+    except Exception:
+        force_rescrape = False
+
+    start_date, end_date = prompt_for_date_range()
+
+    main_search_config = CaseSearchConfig(
+        court_departments=["Housing Court"],
+        court_divisions=["Northeast Housing Court"],
+        court_locations=["Northeast Housing Court"],
+        results_per_page="75",
+        start_date=start_date,
+        end_date=end_date,
+        case_types=["Housing Court Summary Process"],
+        cities=["All Cities"],
+        statuses=["Active", "Closed"],
+        party_types=["Plaintiff"],
+        min_sleep=1,
+        max_sleep=2,
+    )
+
+    # dates are produced lazily, only their count is needed up front
+    dates_to_search = expand_date_range(
+        main_search_config.start_date, main_search_config.end_date
+    )
+    days_to_search = count_date_range(
+        main_search_config.start_date, main_search_config.end_date
+    )
+
+    # create a record of verbose runs
+    data_dir = Path(data_dir_path or "data")
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    verbose_path = data_dir / "verbose.json"
+    verbose_log_path = data_dir / "verbose.jsonl"
+    cases_dir = data_dir / "cases"
+
+    # load existing records (overlapping dates are skipped unless forced, then overwritten)
+    results = load_records(verbose_path)
+    # dates finished by a run that never got to save
+    results.update(load_results_log(verbose_log_path))
+
+    if not force_rescrape:
+        dates_to_search = skip_cached_dates(dates_to_search, results)
+
+    # each date is appended as soon as it's done
+    verbose_log = open_append_log(verbose_log_path)
+
+    # access the website (reuses the persisted browser profile)
+    driver = start_driver(data_dir / "chrome-profile", pinned_url=website_url)
+    driver.get(website_url)
+
+    # plain HTTP case page requests, the browser fallback stays on the date's thread
+    fetch_executor = ThreadPoolExecutor(max_workers=fetch_workers)
+
+    try:
+        # a still-valid session cookie redirects straight to the search page
+        WebDriverWait(driver, verified_timeout, poll_frequency=poll_frequency).until(
+            EC.url_contains("search.page")
+        )
+        print("Existing session is still verified")
+    except TimeoutException:
+        print("Please prove that you're not a robot")
         try:
-            # shutdown the driver (if it exists)
-            driver.close()
-        except Exception:
-            pass
+            # wait for user to complete recaptcha
+            WebDriverWait(driver, 180).until(EC.url_contains("search.page"))
+            print("Human verification completed successfully")
+        except TimeoutException:
+            print("Human verification was not completed within the tme limit")
+            quit_driver(driver)
 
-        # safe write of the results
-        write_json_atomic(verbose_path, results)
-        print(f'Records saved to "{verbose_path}"')
+    drivers: List[WebDriver] = [driver]
 
+    try:
+        # each extra browser shares the verified session, only the first one needed a window
+        drivers += [
+            clone_session(driver, driver.current_url, headless=headless)
+            for _ in range(min(max_concurrency, days_to_search) - 1)
+        ]
+        for d in drivers:
+            # only the page source is kept, skip the heavy subresources
+            block_page_assets(d)
+
+        scrape = partial(
+            scrape_date,
+            search_config=main_search_config,
+            results=results,
+            verbose_log=verbose_log,
+            fetch_executor=fetch_executor,
+            cases_dir=cases_dir,
+        )
+        map_on_idle_drivers(drivers, scrape, dates_to_search)
     except Exception as e:
-        print(f"Failed to save the run due to the exception: {e}")
+        print(f"Run failed due to the exception: {e}")
+    finally:
+        fetch_executor.shutdown()
+        try:
+            # shutdown the drivers and their chromedriver processes (if they exist)
+            for d in drivers:
+                quit_driver(d)
+
+            # safe write of the results, which now hold everything the log did
+            write_json_atomic(verbose_path, results)
+            print(f'Records saved to "{verbose_path}"')
+
+            verbose_log.close()
+            verbose_log_path.unlink(missing_ok=True)
+
+        except Exception as e:
+            print(f"Failed to save the run due to the exception: {e}")
+
+
+if __name__ == "__main__":
+    main()